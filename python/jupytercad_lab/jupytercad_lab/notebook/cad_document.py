@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import tempfile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from pycrdt import Array, Doc, Map
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from ypywidgets.comm import CommWidget
 
 from .objects._schema.any import IAny
@@ -30,7 +31,13 @@ from .objects import (
 )
 from .utils import normalize_path
 
-logger = logging.getLogger(__file__)
+# pythonocc-core is optional, it is only needed by `CadDocument.add_occ_shape`
+try:
+    from OCC.Core.BRepTools import breptools_Write as _breptools_Write
+except ImportError:
+    _breptools_Write = None
+
+logger = logging.getLogger(__name__)
 
 
 class CadDocument(CommWidget):
@@ -56,14 +63,66 @@ class CadDocument(CommWidget):
         self.ydoc["outputs"] = self._outputs = Map()
         self.ydoc["options"] = self._options = Map()
 
+        # Name -> index cache of the objects array, so that name lookups do not
+        # have to walk the whole shared array. Local writes update it directly,
+        # the observer only applies the changes coming from other peers.
+        self._names: List[str] = [x["name"] for x in self._objects_array]
+        self._name_index: Dict[str, int] = {
+            name: index for index, name in enumerate(self._names)
+        }
+        self._local_objects_change = False
+        self._objects_array.observe(self._on_objects_change)
+
     @property
     def objects(self) -> List[str]:
         """
         Get the list of objects that the document contains as a list of strings.
         """
-        if self._objects_array:
-            return [x["name"] for x in self._objects_array]
-        return []
+        return list(self._names)
+
+    def _on_objects_change(self, event) -> None:
+        if self._local_objects_change:
+            # The cache is already up to date
+            self._local_objects_change = False
+            return
+
+        cursor = 0
+        first_change = None
+        for op in event.delta:
+            if "retain" in op:
+                cursor += op["retain"]
+                continue
+            if first_change is None:
+                first_change = cursor
+            if "insert" in op:
+                inserted = [x["name"] for x in op["insert"]]
+                self._names[cursor:cursor] = inserted
+                cursor += len(inserted)
+            elif "delete" in op:
+                for name in self._names[cursor : cursor + op["delete"]]:
+                    self._name_index.pop(name, None)
+                del self._names[cursor : cursor + op["delete"]]
+
+        if first_change is not None:
+            self._reindex_names(first_change)
+
+    def _reindex_names(self, start: int) -> None:
+        for index in range(start, len(self._names)):
+            self._name_index[self._names[index]] = index
+
+    def _append_object(self, obj_dict: Dict) -> None:
+        name = obj_dict["name"]
+        # Set before appending, the observer runs on commit which may be immediate
+        self._local_objects_change = True
+        self._objects_array.append(Map(obj_dict))
+        self._name_index[name] = len(self._names)
+        self._names.append(name)
+
+    def _pop_object(self, index: int) -> None:
+        self._local_objects_change = True
+        self._objects_array.pop(index)
+        self._name_index.pop(self._names.pop(index), None)
+        self._reindex_names(index)
 
     @classmethod
     def _path_to_comm(cls, filePath: Optional[str]) -> Dict:
@@ -73,10 +132,8 @@ class CadDocument(CommWidget):
 
         if filePath is not None:
             path = normalize_path(filePath)
-            file_name = Path(path).name
-            try:
-                ext = file_name.split(".")[1].lower()
-            except Exception:
+            ext = Path(path).suffix[1:].lower()
+            if not ext:
                 raise ValueError("Can not detect file extension!")
             if ext == "fcstd":
                 format = "base64"
@@ -112,19 +169,80 @@ class CadDocument(CommWidget):
     def remove(self, name: str) -> CadDocument:
         index = self._get_yobject_index_by_name(name)
         if self._objects_array and index != -1:
-            self._objects_array.pop(index)
+            self._pop_object(index)
         return self
 
     def add_object(self, new_object: "PythonJcadObject") -> CadDocument:
-        if self._objects_array is not None and not self.check_exist(new_object.name):
-            obj_dict = json.loads(new_object.model_dump_json())
+        return self._add_object_dict(new_object.model_dump(mode="json"))
+
+    def _add_object_dict(self, obj_dict: Dict) -> CadDocument:
+        """
+        Append an object, given as a plain dictionary, to the document.
+        Unlike `add_object`, the data is not validated against the schema.
+        """
+        if self._objects_array is not None and not self.check_exist(obj_dict["name"]):
             obj_dict["visible"] = True
-            new_map = Map(obj_dict)
-            self._objects_array.append(new_map)
+            self._append_object(obj_dict)
         else:
-            logger.error(f"Object {new_object.name} already exists")
+            logger.error("Object %s already exists", obj_dict["name"])
+        return self
+
+    def _add_shape(self, obj_dict: Dict) -> CadDocument:
+        """
+        Validate the parameters of an object dictionary against the model of
+        its shape, then append it to the document.
+        """
+        return self._add_object_dict(self._validate_parameters(obj_dict))
+
+    def _validate_parameters(self, obj_dict: Dict) -> Dict:
+        parameters = OBJECT_FACTORY.create_parameters(
+            obj_dict["shape"], obj_dict["parameters"]
+        )
+        obj_dict["parameters"] = parameters.model_dump(mode="json")
+        return obj_dict
+
+    def _add_bulk_objects(
+        self,
+        obj_type: str,
+        names: Optional[Sequence[str]],
+        obj_dicts: List[Dict],
+    ) -> CadDocument:
+        if names is not None and len(names) != len(obj_dicts):
+            raise ValueError("All the shape parameters must have the same length.")
+
+        with self.ydoc.transaction():
+            if names is None:
+                names = self._new_names(obj_type, len(obj_dicts))
+            for name, obj_dict in zip(names, obj_dicts):
+                obj_dict["name"] = name
+                self._add_object_dict(obj_dict)
         return self
 
+    def _bulk_placements(
+        self,
+        count: int,
+        position: Optional[Sequence[Sequence[float]]],
+        rotation_axis: Optional[Sequence[Sequence[float]]],
+        rotation_angle: Optional[Sequence[float]],
+    ) -> List[Dict]:
+        if position is None:
+            position = [[0, 0, 0]] * count
+        if rotation_axis is None:
+            rotation_axis = [[0, 0, 1]] * count
+        if rotation_angle is None:
+            rotation_angle = [0] * count
+        if not len(position) == len(rotation_axis) == len(rotation_angle) == count:
+            raise ValueError("All the shape parameters must have the same length.")
+
+        return [
+            {
+                "Position": [float(v) for v in pos],
+                "Axis": [float(v) for v in axis],
+                "Angle": float(angle),
+            }
+            for pos, axis, angle in zip(position, rotation_axis, rotation_angle)
+        ]
+
     def add_annotation(
         self,
         parent: str,
@@ -177,13 +295,18 @@ class CadDocument(CommWidget):
         self,
         path: str,
         name: str = "",
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
+        if position is None:
+            position = [0, 0, 0]
+        if rotation_axis is None:
+            rotation_axis = [0, 0, 1]
+
         shape_name = name if name else Path(path).stem
         if self.check_exist(shape_name):
-            logger.error(f"Object {shape_name} already exists")
+            logger.error("Object %s already exists", shape_name)
             return
 
         with open(path, "r") as fobj:
@@ -204,7 +327,7 @@ class CadDocument(CommWidget):
             "visible": True,
         }
 
-        self._objects_array.append(Map(data))
+        self._append_object(data)
 
         return self
 
@@ -212,8 +335,8 @@ class CadDocument(CommWidget):
         self,
         shape,
         name: str = "",
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -227,19 +350,27 @@ class CadDocument(CommWidget):
         :param rotation_angle: The shape rotation angle, in degrees.
         :return: The document itself.
         """
-        try:
-            from OCC.Core.BRepTools import breptools_Write
-        except ImportError:
+        if position is None:
+            position = [0, 0, 0]
+        if rotation_axis is None:
+            rotation_axis = [0, 0, 1]
+
+        if _breptools_Write is None:
             raise RuntimeError("Cannot add an OpenCascade shape if it's not installed.")
 
         shape_name = name if name else self._new_name("OCCShape")
         if self.check_exist(shape_name):
-            logger.error(f"Object {shape_name} already exists")
+            logger.error("Object %s already exists", shape_name)
             return
 
-        with tempfile.NamedTemporaryFile() as tmp:
-            breptools_Write(shape, tmp.name, True, False, 1)
-            brepdata = tmp.read().decode("ascii")
+        # Write to a closed temporary path, the file cannot be opened twice on Windows
+        fd, tmp_path = tempfile.mkstemp(suffix=".brep")
+        os.close(fd)
+        try:
+            _breptools_Write(shape, tmp_path, True, False, 1)
+            brepdata = Path(tmp_path).read_text("ascii")
+        finally:
+            os.unlink(tmp_path)
 
         data = {
             "shape": "Part::Any",
@@ -256,7 +387,7 @@ class CadDocument(CommWidget):
             "visible": True,
         }
 
-        self._objects_array.append(Map(data))
+        self._append_object(data)
 
         return self
 
@@ -267,8 +398,8 @@ class CadDocument(CommWidget):
         width: float = 1,
         height: float = 1,
         color: str = "#808080",
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -284,6 +415,11 @@ class CadDocument(CommWidget):
         :param rotation_angle: The shape rotation angle, in degrees.
         :return: The document itself.
         """
+        if position is None:
+            position = [0, 0, 0]
+        if rotation_axis is None:
+            rotation_axis = [0, 0, 1]
+
         data = {
             "shape": Parts.Part__Box.value,
             "name": name if name else self._new_name("Box"),
@@ -299,7 +435,58 @@ class CadDocument(CommWidget):
                 },
             },
         }
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        return self._add_shape(data)
+
+    def add_boxes(
+        self,
+        names: Optional[Sequence[str]] = None,
+        *,
+        length: Sequence[float],
+        width: Sequence[float],
+        height: Sequence[float],
+        color: str = "#808080",
+        position: Optional[Sequence[Sequence[float]]] = None,
+        rotation_axis: Optional[Sequence[Sequence[float]]] = None,
+        rotation_angle: Optional[Sequence[float]] = None,
+    ) -> CadDocument:
+        """
+        Add several boxes to the document in a single transaction.
+        The dimension and placement parameters hold one value per box, e.g. as a list or a NumPy array.
+
+        :param names: The names that will be used for the objects in the document.
+        :param length: The lengths of the boxes.
+        :param width: The widths of the boxes.
+        :param height: The heights of the boxes.
+        :param color: The color of the boxes in hex format (e.g., "#FF5733").
+        :param position: The shapes 3D positions.
+        :param rotation_axis: The 3D axes used for the rotations.
+        :param rotation_angle: The shapes rotation angles, in degrees.
+        :return: The document itself.
+        """  # noqa E501
+        count = len(length)
+        if not len(width) == len(height) == count:
+            raise ValueError("All the shape parameters must have the same length.")
+        placements = self._bulk_placements(
+            count, position, rotation_axis, rotation_angle
+        )
+
+        # Validate everything first so that invalid input does not add any box
+        data = [
+            self._validate_parameters(
+                {
+                    "shape": Parts.Part__Box.value,
+                    "parameters": {
+                        "Length": length[i],
+                        "Width": width[i],
+                        "Height": height[i],
+                        "Color": color,
+                        "Placement": placements[i],
+                    },
+                }
+            )
+            for i in range(count)
+        ]
+        return self._add_bulk_objects("Box", names, data)
 
     def add_cone(
         self,
@@ -309,8 +496,8 @@ class CadDocument(CommWidget):
         height: float = 1,
         angle: float = 360,
         color: str = "#808080",
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -327,6 +514,11 @@ class CadDocument(CommWidget):
         :param rotation_angle: The shape rotation angle, in degrees.
         :return: The document itself.
         """  # noqa 501
+        if position is None:
+            position = [0, 0, 0]
+        if rotation_axis is None:
+            rotation_axis = [0, 0, 1]
+
         data = {
             "shape": Parts.Part__Cone.value,
             "name": name if name else self._new_name("Cone"),
@@ -343,7 +535,7 @@ class CadDocument(CommWidget):
                 },
             },
         }
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        return self._add_shape(data)
 
     def add_cylinder(
         self,
@@ -352,8 +544,8 @@ class CadDocument(CommWidget):
         height: float = 1,
         angle: float = 360,
         color: str = "#808080",
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -369,6 +561,11 @@ class CadDocument(CommWidget):
         :param rotation_angle: The shape rotation angle, in degrees.
         :return: The document itself.
         """  # noqa E501
+        if position is None:
+            position = [0, 0, 0]
+        if rotation_axis is None:
+            rotation_axis = [0, 0, 1]
+
         data = {
             "shape": Parts.Part__Cylinder.value,
             "name": name if name else self._new_name("Cylinder"),
@@ -384,7 +581,7 @@ class CadDocument(CommWidget):
                 },
             },
         }
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        return self._add_shape(data)
 
     def add_sphere(
         self,
@@ -394,8 +591,8 @@ class CadDocument(CommWidget):
         angle2: float = 90,
         angle3: float = 360,
         color: str = "#808080",
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -412,6 +609,11 @@ class CadDocument(CommWidget):
         :param rotation_angle: The shape rotation angle, in degrees.
         :return: The document itself.
         """  # noqa E501
+        if position is None:
+            position = [0, 0, 0]
+        if rotation_axis is None:
+            rotation_axis = [0, 0, 1]
+
         data = {
             "shape": Parts.Part__Sphere.value,
             "name": name if name else self._new_name("Sphere"),
@@ -428,7 +630,59 @@ class CadDocument(CommWidget):
                 },
             },
         }
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        return self._add_shape(data)
+
+    def add_spheres(
+        self,
+        names: Optional[Sequence[str]] = None,
+        *,
+        radius: Sequence[float],
+        angle1: float = -90,
+        angle2: float = 90,
+        angle3: float = 360,
+        color: str = "#808080",
+        position: Optional[Sequence[Sequence[float]]] = None,
+        rotation_axis: Optional[Sequence[Sequence[float]]] = None,
+        rotation_angle: Optional[Sequence[float]] = None,
+    ) -> CadDocument:
+        """
+        Add several spheres to the document in a single transaction.
+        The radius and placement parameters hold one value per sphere, e.g. as a list or a NumPy array.
+
+        :param names: The names that will be used for the objects in the document.
+        :param radius: The radii of the spheres.
+        :param angle1: The revolution angle of the spheres on the X axis (0: no sphere, 180: half sphere, 360: full sphere).
+        :param angle2: The revolution angle of the spheres on the Y axis (0: no sphere, 180: half sphere, 360: full sphere).
+        :param angle3: The revolution angle of the spheres on the Z axis (0: no sphere, 180: half sphere, 360: full sphere).
+        :param color: The color of the spheres in hex format (e.g., "#FF5733").
+        :param position: The shapes 3D positions.
+        :param rotation_axis: The 3D axes used for the rotations.
+        :param rotation_angle: The shapes rotation angles, in degrees.
+        :return: The document itself.
+        """  # noqa E501
+        count = len(radius)
+        placements = self._bulk_placements(
+            count, position, rotation_axis, rotation_angle
+        )
+
+        # Validate everything first so that invalid input does not add any sphere
+        data = [
+            self._validate_parameters(
+                {
+                    "shape": Parts.Part__Sphere.value,
+                    "parameters": {
+                        "Radius": radius[i],
+                        "Angle1": angle1,
+                        "Angle2": angle2,
+                        "Angle3": angle3,
+                        "Color": color,
+                        "Placement": placements[i],
+                    },
+                }
+            )
+            for i in range(count)
+        ]
+        return self._add_bulk_objects("Sphere", names, data)
 
     def add_torus(
         self,
@@ -439,8 +693,8 @@ class CadDocument(CommWidget):
         angle2: float = 180,
         angle3: float = 360,
         color: str = "#808080",
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -458,6 +712,11 @@ class CadDocument(CommWidget):
         :param rotation_angle: The shape rotation angle, in degrees.
         :return: The document itself.
         """  # noqa E501
+        if position is None:
+            position = [0, 0, 0]
+        if rotation_axis is None:
+            rotation_axis = [0, 0, 1]
+
         data = {
             "shape": Parts.Part__Torus.value,
             "name": name if name else self._new_name("Torus"),
@@ -475,7 +734,7 @@ class CadDocument(CommWidget):
                 },
             },
         }
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        return self._add_shape(data)
 
     def cut(
         self,
@@ -484,8 +743,8 @@ class CadDocument(CommWidget):
         tool: str | int = None,
         refine: bool = False,
         color: Optional[str] = None,
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -518,9 +777,12 @@ class CadDocument(CommWidget):
                 "Placement": {"Position": [0, 0, 0], "Axis": [0, 0, 1], "Angle": 0},
             },
         }
-        self.set_visible(base, False)
-        self.set_visible(tool, False)
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        # Validate before hiding the operands, so that invalid input changes nothing
+        self._validate_parameters(data)
+        with self.ydoc.transaction():
+            self.set_visible(base, False)
+            self.set_visible(tool, False)
+            return self._add_object_dict(data)
 
     def fuse(
         self,
@@ -529,8 +791,8 @@ class CadDocument(CommWidget):
         shape2: str | int = None,
         refine: bool = False,
         color: Optional[str] = None,
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -561,9 +823,12 @@ class CadDocument(CommWidget):
                 "Placement": {"Position": [0, 0, 0], "Axis": [0, 0, 1], "Angle": 0},
             },
         }
-        self.set_visible(shape1, False)
-        self.set_visible(shape2, False)
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        # Validate before hiding the operands, so that invalid input changes nothing
+        self._validate_parameters(data)
+        with self.ydoc.transaction():
+            self.set_visible(shape1, False)
+            self.set_visible(shape2, False)
+            return self._add_object_dict(data)
 
     def intersect(
         self,
@@ -572,8 +837,8 @@ class CadDocument(CommWidget):
         shape2: str | int = None,
         refine: bool = False,
         color: Optional[str] = None,
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -605,9 +870,12 @@ class CadDocument(CommWidget):
                 "Placement": {"Position": [0, 0, 0], "Axis": [0, 0, 1], "Angle": 0},
             },
         }
-        self.set_visible(shape1, False)
-        self.set_visible(shape2, False)
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        # Validate before hiding the operands, so that invalid input changes nothing
+        self._validate_parameters(data)
+        with self.ydoc.transaction():
+            self.set_visible(shape1, False)
+            self.set_visible(shape2, False)
+            return self._add_object_dict(data)
 
     def chamfer(
         self,
@@ -616,8 +884,8 @@ class CadDocument(CommWidget):
         edge: int = 0,
         dist: float = 0.1,
         color: Optional[str] = None,
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -650,8 +918,11 @@ class CadDocument(CommWidget):
                 "Placement": {"Position": [0, 0, 0], "Axis": [0, 0, 1], "Angle": 0},
             },
         }
-        self.set_visible(shape, False)
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        # Validate before hiding the operands, so that invalid input changes nothing
+        self._validate_parameters(data)
+        with self.ydoc.transaction():
+            self.set_visible(shape, False)
+            return self._add_object_dict(data)
 
     def fillet(
         self,
@@ -660,8 +931,8 @@ class CadDocument(CommWidget):
         edge: int = 0,
         radius: float = 0.1,
         color: Optional[str] = None,
-        position: List[float] = [0, 0, 0],
-        rotation_axis: List[float] = [0, 0, 1],
+        position: Optional[List[float]] = None,
+        rotation_axis: Optional[List[float]] = None,
         rotation_angle: float = 0,
     ) -> CadDocument:
         """
@@ -694,22 +965,25 @@ class CadDocument(CommWidget):
                 "Placement": {"Position": [0, 0, 0], "Axis": [0, 0, 1], "Angle": 0},
             },
         }
-        self.set_visible(shape, False)
-        return self.add_object(OBJECT_FACTORY.create_object(data, self))
+        # Validate before hiding the operands, so that invalid input changes nothing
+        self._validate_parameters(data)
+        with self.ydoc.transaction():
+            self.set_visible(shape, False)
+            return self._add_object_dict(data)
 
     def _get_operand(self, shape: str | int | None, default_idx: int = -1):
         if isinstance(shape, str):
-            if shape not in self.objects:
+            if shape not in self._name_index:
                 raise ValueError(f"Unknown object {shape}")
         elif isinstance(shape, int):
-            shape = self.objects[shape]
+            shape = self._names[shape]
         else:
-            shape = self.objects[default_idx]
+            shape = self._names[default_idx]
 
         return shape
 
     def _get_boolean_operands(self, shape1: str | int | None, shape2: str | int | None):
-        if len(self.objects) < 2:
+        if len(self._names) < 2:
             raise ValueError(
                 "Cannot apply boolean operator if there are less than two objects in the document."  # noqa E501
             )
@@ -727,6 +1001,25 @@ class CadDocument(CommWidget):
 
         obj["visible"] = value
 
+    def set_visible_many(self, items: Dict[str, bool]) -> None:
+        """
+        Set the visibility of several objects in a single transaction.
+        All the names are resolved first, so if one of them does not exist
+        a RuntimeError is raised and no object is modified.
+
+        :param items: A mapping from object names to their visibility.
+        """
+        objects = []
+        for name, value in items.items():
+            obj: Optional[Map] = self._get_yobject_by_name(name)
+            if obj is None:
+                raise RuntimeError(f"No object named {name}")
+            objects.append((obj, value))
+
+        with self.ydoc.transaction():
+            for obj, value in objects:
+                obj["visible"] = value
+
     def set_color(self, name: str, value: str):
         obj: Optional[Map] = self._get_yobject_by_name(name)
 
@@ -737,35 +1030,40 @@ class CadDocument(CommWidget):
         obj["parameters"] = parameters
 
     def check_exist(self, name: str) -> bool:
-        if self.objects:
-            return name in self.objects
-        return False
+        return name in self._name_index
 
     def _get_yobject_by_name(self, name: str) -> Optional[Map]:
-        if self._objects_array:
-            for index, item in enumerate(self._objects_array):
-                if item["name"] == name:
-                    return self._objects_array[index]
-        return None
+        index = self._name_index.get(name)
+        if index is None:
+            return None
+        return self._objects_array[index]
 
     def _get_yobject_index_by_name(self, name: str) -> int:
-        if self._objects_array:
-            for index, item in enumerate(self._objects_array):
-                if item["name"] == name:
-                    return index
-        return -1
+        return self._name_index.get(name, -1)
 
     def _new_name(self, obj_type: str) -> str:
         n = 1
         name = f"{obj_type} 1"
-        objects = self.objects
 
-        while name in objects:
-            name = f"{obj_type} {n}"
+        while name in self._name_index:
             n += 1
+            name = f"{obj_type} {n}"
 
         return name
 
+    def _new_names(self, obj_type: str, count: int) -> List[str]:
+        # One running counter for the whole batch, rather than restarting
+        # from 1 for each name as repeated `_new_name` calls would
+        names = []
+        n = 0
+        while len(names) < count:
+            n += 1
+            name = f"{obj_type} {n}"
+            if name not in self._name_index:
+                names.append(name)
+
+        return names
+
 
 class PythonJcadObject(BaseModel):
     class Config:
@@ -789,33 +1087,48 @@ class PythonJcadObject(BaseModel):
         IChamfer,
     ]
     metadata: Optional[ShapeMetadata]
-    _caddoc = Optional[CadDocument]
+    _caddoc_cache: Optional[CadDocument] = PrivateAttr(default=None)
     _parent = Optional[CadDocument]
 
     def __init__(__pydantic_self__, parent, **data: Any) -> None:  # noqa
         super().__init__(**data)
-        __pydantic_self__._caddoc = CadDocument()
-        __pydantic_self__._caddoc.add_object(__pydantic_self__)
         __pydantic_self__._parent = parent
 
+    @property
+    def _caddoc(self) -> CadDocument:
+        # Most objects are only used as intermediate values, only create
+        # their own document (and its comm) when it is actually needed.
+        if self._caddoc_cache is None:
+            self._caddoc_cache = CadDocument()
+            self._caddoc_cache.add_object(self)
+        return self._caddoc_cache
+
 
 class SingletonMeta(type):
     _instances = {}
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            instance = super().__call__(*args, **kwargs)
-            cls._instances[cls] = instance
-        return cls._instances[cls]
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+        # setdefault keeps the first registered instance if two threads race here
+        return cls._instances.setdefault(cls, super().__call__(*args, **kwargs))
 
 
 class ObjectFactoryManager(metaclass=SingletonMeta):
     def __init__(self):
         self._factories: Dict[str, type[BaseModel]] = {}
+        self._fields: Dict[str, Tuple[str, ...]] = {}
 
     def register_factory(self, shape_type: str, cls: type[BaseModel]) -> None:
         if shape_type not in self._factories:
             self._factories[shape_type] = cls
+            self._fields[shape_type] = tuple(cls.model_fields)
+
+    def create_parameters(self, shape_type: str, params: Dict) -> BaseModel:
+        Model = self._factories[shape_type]
+        fields = self._fields[shape_type]
+        return Model(**{field: params.get(field, None) for field in fields})
 
     def create_object(
         self, data: Dict, parent: Optional[CadDocument] = None
@@ -823,13 +1136,9 @@ class ObjectFactoryManager(metaclass=SingletonMeta):
         object_type = data.get("shape", None)
         name: str = data.get("name", None)
         meta = data.get("shapeMetadata", None)
-        if object_type and object_type in self._factories:
-            Model = self._factories[object_type]
-            args = {}
-            params = data["parameters"]
-            for field in Model.model_fields:
-                args[field] = params.get(field, None)
-            obj_params = Model(**args)
+        Model = self._factories.get(object_type)
+        if Model is not None:
+            obj_params = self.create_parameters(object_type, data["parameters"])
             return PythonJcadObject(
                 parent=parent,
                 name=name,
@@ -3,7 +3,7 @@ from typing import Optional
 
 from ypywidgets import Widget
 
-logger = logging.getLogger(__file__)
+logger = logging.getLogger(__name__)
 
 
 class YDocConnector(Widget):